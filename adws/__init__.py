@@ -0,0 +1,3 @@
+"""
+Agentic Development Workflows (ADW).
+"""
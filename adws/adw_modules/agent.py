@@ -4,14 +4,19 @@ Agent execution module for running Claude Code CLI commands.
 Handles subprocess execution, JSONL output parsing, and retry logic.
 """
 
-import json
+import functools
+import random
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from dataclasses import asdict, replace
 from pathlib import Path
-from typing import Optional, List, Dict, Final
+from typing import Optional, List, Dict, Final, Iterable, Tuple, Union
 
+from . import json_utils, llm_cache
+from .claude_worker import ClaudeWorker
 from .data_types import (
     AgentTemplateRequest,
     AgentPromptResponse,
@@ -33,6 +38,13 @@ SLASH_COMMAND_MODEL_MAP: Final[Dict[SlashCommand, Dict[ModelSet, ModelName]]] =
     "/test": {"base": "sonnet", "heavy": "sonnet"},
 }
 
+# Flattened (slash_command, model_set) -> model view of the map above
+_FLAT_MODEL_MAP: Final[Dict[Tuple[SlashCommand, ModelSet], ModelName]] = {
+    (command, model_set): model
+    for command, models in SLASH_COMMAND_MODEL_MAP.items()
+    for model_set, model in models.items()
+}
+
 
 def get_model_for_slash_command(
     slash_command: SlashCommand,
@@ -48,61 +60,70 @@ def get_model_for_slash_command(
     Returns:
         Model name to use (sonnet, opus, or haiku)
     """
-    command_models = SLASH_COMMAND_MODEL_MAP.get(slash_command)
-    if not command_models:
-        return "sonnet"  # Default fallback
+    return _FLAT_MODEL_MAP.get((slash_command, model_set), "sonnet")  # Default fallback
 
-    return command_models.get(model_set, "sonnet")
 
-
-def parse_jsonl_output(output: str) -> AgentPromptResponse:
+def parse_jsonl_output(
+    lines: Iterable[Union[str, bytes]],
+    keep_raw: bool = False,
+    stop_at_result: bool = False,
+) -> AgentPromptResponse:
     """
     Parse JSON output from Claude Code CLI.
 
+    Lines are decoded one at a time as they arrive, so a single JSON object
+    (--output-format json) and JSONL streams are handled the same way.
+    Decoding stops at the terminal "result" message (later lines are only
+    collected when raw output is kept); callers reading from a pipe must drain
+    whatever is left.
+
     Args:
-        output: Raw JSON output string
+        lines: Iterable of raw output lines, str or bytes (e.g. a process stdout)
+        keep_raw: Whether to keep the complete raw output on the response
+        stop_at_result: Stop reading at the result message even when keeping
+            raw output, for streams that do not end there (a persistent worker)
 
     Returns:
         Parsed response with result or error
     """
     result_message: Optional[str] = None
     error_message: Optional[str] = None
-
-    try:
-        # Try parsing as single JSON object first (--output-format json)
-        data = json.loads(output.strip())
-
-        if isinstance(data, dict):
-            # Check for error
-            if data.get("is_error") or data.get("type") == "error":
-                error_message = data.get("error") or data.get("result")
-            # Extract result
-            elif "result" in data:
-                result_message = data["result"]
-            elif "text" in data:
-                result_message = data["text"]
-
-    except json.JSONDecodeError:
-        # Fallback: Try parsing as JSONL (multiple JSON objects)
-        lines = output.strip().split("\n")
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            try:
-                data = json.loads(line)
-
-                if isinstance(data, dict):
-                    if "result" in data:
-                        result_message = data["result"]
-                    elif "text" in data:
-                        result_message = data["text"]
-                    elif "error" in data:
-                        error_message = data["error"]
-
-            except json.JSONDecodeError:
-                continue
+    raw_lines: Optional[List[Union[str, bytes]]] = [] if keep_raw else None
+    parser = json_utils.FieldParser(("is_error", "type", "error", "result", "text"))
+
+    finished = False
+
+    for line in lines:
+        if raw_lines is not None:
+            raw_lines.append(line)
+
+        if finished or not line.strip():
+            continue
+
+        try:
+            data = parser.parse(line)
+        except json_utils.JSONDecodeError:
+            continue
+
+        if data is None:
+            continue
+
+        # Check for error
+        if data.get("is_error") or data.get("type") == "error":
+            error_message = data.get("error") or data.get("result")
+        # Extract result
+        elif "result" in data:
+            result_message = data["result"]
+        elif "text" in data:
+            result_message = data["text"]
+        elif "error" in data:
+            error_message = data["error"]
+
+        # The CLI's result message is final; skip decoding anything after it
+        if data.get("type") == "result":
+            if raw_lines is None or stop_at_result:
+                break
+            finished = True
 
     success = result_message is not None and error_message is None
 
@@ -110,11 +131,25 @@ def parse_jsonl_output(output: str) -> AgentPromptResponse:
         success=success,
         result=result_message,
         error=error_message,
-        raw_output=output,
+        raw_output=_join_lines(raw_lines) if raw_lines is not None else None,
         should_retry=False,
     )
 
 
+def _join_lines(lines: List[Union[str, bytes]]) -> str:
+    """Join captured output lines, decoding bytes as UTF-8."""
+    return "".join(
+        line.decode("utf-8", "replace") if isinstance(line, bytes) else line
+        for line in lines
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def find_claude_cli() -> Optional[str]:
+    """Locate the Claude Code CLI on PATH (resolved once per process)."""
+    return shutil.which("claude")
+
+
 def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
     """
     Execute a slash command template via Claude Code CLI.
@@ -126,7 +161,7 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
         Response with result or error
     """
     # Get Claude Code CLI path from system PATH
-    claude_path_str = shutil.which("claude")
+    claude_path_str = find_claude_cli()
     if not claude_path_str:
         return AgentPromptResponse(
             success=False,
@@ -160,33 +195,74 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
     # Set working directory
     working_dir = request.working_dir or Path.cwd()
 
+    # Reuse a persistent worker when enabled, falling back to a one-shot run
+    if ClaudeWorker.enabled():
+        worker = ClaudeWorker.get(str(claude_path), model, str(working_dir))
+        lines = worker.send(request.slash_command, request.args)
+        try:
+            return parse_jsonl_output(
+                lines,
+                keep_raw=request.keep_raw_output,
+                stop_at_result=True,
+            )
+        except RuntimeError as e:
+            print(f"Claude worker failed, running one-shot: {e}", file=sys.stderr)
+            worker.close()
+        finally:
+            lines.close()
+
     try:
-        # Execute command
-        result = subprocess.run(
+        # Stream stdout as bytes into the parser; close_fds=False keeps posix_spawn
+        process = subprocess.Popen(
             command_parts,
-            cwd=working_dir,
-            capture_output=True,
-            text=True,
-            timeout=600,  # 10 minute timeout
+            cwd=request.working_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+        )
+
+        # Drain stderr in the background so a chatty CLI cannot block on it
+        stderr_chunks: List[bytes] = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),
+            daemon=True,
         )
+        stderr_reader.start()
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout() -> None:
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(600, kill_on_timeout)  # 10 minute timeout
+        timer.start()
+        try:
+            response = parse_jsonl_output(process.stdout, keep_raw=request.keep_raw_output)
+            # Discard any trailing output undecoded so the CLI never blocks on a full pipe
+            process.stdout.read()
+            process.wait()
+        finally:
+            timer.cancel()
+        stderr_reader.join()
+
+        if timed_out.is_set():
+            return AgentPromptResponse(
+                success=False,
+                error="Command timed out after 10 minutes",
+                should_retry=True,
+            )
 
-        if result.returncode != 0:
+        if process.returncode != 0:
             return AgentPromptResponse(
                 success=False,
-                error=f"Command failed with code {result.returncode}: {result.stderr}",
-                raw_output=result.stdout,
+                error=f"Command failed with code {process.returncode}: {_join_lines(stderr_chunks)}",
+                raw_output=response.raw_output,
                 should_retry=True,
             )
 
-        # Parse output
-        return parse_jsonl_output(result.stdout)
+        return response
 
-    except subprocess.TimeoutExpired:
-        return AgentPromptResponse(
-            success=False,
-            error="Command timed out after 10 minutes",
-            should_retry=True,
-        )
     except Exception as e:
         return AgentPromptResponse(
             success=False,
@@ -198,28 +274,47 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
 def prompt_claude_code_with_retry(
     request: AgentTemplateRequest,
     max_retries: int = 3,
+    base_delay: float = 0.5,
+    cap: float = 10.0,
 ) -> AgentPromptResponse:
     """
-    Execute template with exponential backoff retry logic.
+    Execute template with jittered exponential backoff retry logic.
+
+    Successful responses to cacheable commands are stored in and served from
+    llm_cache. Each retry sleeps a random "full jitter" delay between 0 and
+    min(cap, base_delay * 2 ** attempt) so concurrent workflows don't retry
+    in lockstep.
 
     Args:
         request: Agent template request
-        max_retries: Maximum number of retry attempts
+        max_retries: Maximum number of attempts
+        base_delay: Backoff base in seconds
+        cap: Upper bound for a single delay in seconds
 
     Returns:
         Final response after retries
     """
-    delays = [1, 3, 5]  # Exponential backoff delays
+    # Serve identical classifier requests from the on-disk cache
+    cache_key: Optional[str] = None
+    if llm_cache.is_cacheable(request):
+        cache_key = llm_cache.make_key(request)
+        cached = llm_cache.lookup(request.adw_id, cache_key)
+        if cached is not None:
+            print(f"Using cached response for {request.slash_command}", file=sys.stderr)
+            return AgentPromptResponse(**cached)
 
     for attempt in range(max_retries):
         response = execute_template(request)
 
+        if response.success and cache_key:
+            llm_cache.store(request.adw_id, cache_key, asdict(replace(response, raw_output=None)))
+
         if response.success or not response.should_retry:
             return response
 
         if attempt < max_retries - 1:
-            delay = delays[min(attempt, len(delays) - 1)]
-            print(f"Retry {attempt + 1}/{max_retries} after {delay}s...", file=sys.stderr)
+            delay = random.uniform(0, min(cap, base_delay * (2.0 ** attempt)))
+            print(f"Retry {attempt + 1}/{max_retries} after {delay:.2f}s...", file=sys.stderr)
             time.sleep(delay)
 
     return response
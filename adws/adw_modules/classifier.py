@@ -0,0 +1,113 @@
+"""
+Issue classification for ADW workflows.
+
+Issues are classified by keyword scan by default, which avoids an LLM call.
+Set ADW_CLASSIFIER=llm to always use the /classify_issue agent; in the default
+keywords mode the agent is only consulted when no keyword matches.
+"""
+
+import os
+import re
+import sys
+from typing import Optional
+
+from .agent import prompt_claude_code_with_retry
+from .data_types import AgentTemplateRequest, IssueClass
+
+# Keyword indicators per issue class, in priority order
+_CLASSIFIER_KEYWORDS = [
+    # Feature indicators (most common)
+    ("/feature", ['implement', 'add', 'create', 'feature', 'new', 'build',
+                  'generation', 'dashboard', 'analytics', 'form', 'component']),
+    # Bug indicators
+    ("/bug", ['fix bug', 'bug:', 'error:', 'broken', 'crash', 'failing test']),
+    # Chore indicators
+    ("/chore", ['refactor', 'update deps', 'upgrade', 'dependency',
+                'setup', 'configure', 'config', 'install', 'architecture', 'scaffold']),
+]
+
+# One substring alternation per class, compiled once
+_CLASSIFIER_PATTERNS = [
+    (issue_class, re.compile("|".join(map(re.escape, keywords))))
+    for issue_class, keywords in _CLASSIFIER_KEYWORDS
+]
+
+# Classes the workflow has planning commands for
+_PLANNABLE_CLASSES = {"/chore", "/bug", "/feature"}
+
+
+def get_strategy() -> str:
+    """Get the classifier strategy from ADW_CLASSIFIER ("keywords" or "llm")."""
+    strategy = os.environ.get("ADW_CLASSIFIER", "keywords")
+    return strategy if strategy in ("keywords", "llm") else "keywords"
+
+
+def classify_issue_keywords(content_lower: str) -> Optional[IssueClass]:
+    """
+    Classify issue content by keyword scan.
+
+    Expects the issue content already lowercased by the caller.
+
+    Returns: /bug, /chore, /feature, or None if no keyword matched
+    """
+    # Each class is one C-level scan; feature is checked FIRST (most common)
+    for issue_class, pattern in _CLASSIFIER_PATTERNS:
+        if pattern.search(content_lower):
+            return issue_class
+    return None
+
+
+def classify_issue_llm(issue_file: str, adw_id: str) -> Optional[IssueClass]:
+    """
+    Classify an issue with the /classify_issue agent.
+
+    The agent gets the path to the issue file rather than the issue text, so
+    argv stays small for large issues.
+
+    Returns: /bug, /chore, /feature, or None if the agent failed or gave
+    any other answer
+    """
+    request = AgentTemplateRequest(
+        agent_name="classifier",
+        slash_command="/classify_issue",
+        args=[issue_file],
+        adw_id=adw_id,
+    )
+
+    response = prompt_claude_code_with_retry(request, max_retries=3)
+    if not response.success:
+        print(f"Warning: Failed to classify issue: {response.error}", file=sys.stderr)
+        return None
+
+    issue_class = response.result.strip()
+    return issue_class if issue_class in _PLANNABLE_CLASSES else None
+
+
+def classify_issue(
+    issue_content: str,
+    issue_file: str,
+    adw_id: str,
+    content_lower: Optional[str] = None,
+) -> IssueClass:
+    """
+    Classify issue into command type using the configured strategy.
+
+    Args:
+        issue_content: Issue title and body
+        issue_file: Path to the issue JSON file, passed to the agent
+        adw_id: Workflow ID
+        content_lower: issue_content already lowercased, if the caller has it
+
+    Returns: /bug, /chore, or /feature (the default when unclassified)
+    """
+    issue_class = None
+    if get_strategy() == "keywords":
+        issue_class = classify_issue_keywords(
+            content_lower if content_lower is not None else issue_content.lower()
+        )
+
+    if issue_class is None:
+        issue_class = classify_issue_llm(issue_file, adw_id)
+
+    # Default to feature
+    return issue_class or "/feature"
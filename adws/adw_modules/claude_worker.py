@@ -0,0 +1,162 @@
+"""
+Persistent Claude Code CLI worker.
+
+Keeps one CLI process per (model, working_dir) alive in stream-json mode so
+successive slash commands skip process startup, config parsing and auth.
+Messages are framed as newline-delimited JSON, which is what the CLI speaks.
+"""
+
+import atexit
+import os
+import subprocess
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import json_utils
+
+
+class ClaudeWorker:
+    """
+    Long-lived Claude Code CLI process reused across slash commands.
+
+    The CLI is started once per (model, working_dir) in stream-json mode and
+    each request is written to stdin as a single JSON line. Response lines are
+    read from stdout until the terminal ``result`` message is seen.
+
+    Because every request sent to a worker shares the same CLI session, the
+    worker is opt-in: set ADW_CLAUDE_WORKER=1 to enable it. If the CLI exits
+    without answering its first request (no streaming input support), workers
+    are disabled for the rest of the process and callers spawn per call.
+    """
+
+    _instances: Dict[Tuple[str, str], "ClaudeWorker"] = {}
+    _lock = threading.Lock()
+    _unsupported = False
+
+    def __init__(self, claude_path: str, model: str, working_dir: str):
+        self.claude_path = claude_path
+        self.model = model
+        self.working_dir = working_dir
+        self.process: Optional[subprocess.Popen] = None
+        self.requests_served = 0
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """Whether persistent workers are enabled and supported by the CLI."""
+        return not cls._unsupported and os.environ.get("ADW_CLAUDE_WORKER", "0") == "1"
+
+    @classmethod
+    def get(cls, claude_path: str, model: str, working_dir: str) -> "ClaudeWorker":
+        """Return the shared worker for this model and working directory."""
+        key = (model, working_dir)
+        with cls._lock:
+            worker = cls._instances.get(key)
+            if worker is None:
+                worker = cls(claude_path, model, working_dir)
+                cls._instances[key] = worker
+            return worker
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Terminate every running worker."""
+        with cls._lock:
+            for worker in cls._instances.values():
+                worker.close()
+            cls._instances.clear()
+
+    def is_alive(self) -> bool:
+        """Check if the worker process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """Start the CLI process if it is not already running."""
+        if self.is_alive():
+            return
+
+        self.process = subprocess.Popen(
+            [
+                self.claude_path,
+                "--model", self.model,
+                "--print",
+                "--input-format", "stream-json",
+                "--output-format", "stream-json",
+                "--verbose",
+            ],
+            cwd=self.working_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=1,
+            text=True,
+        )
+        self.requests_served = 0
+
+    def send(self, slash_command: str, args: List[str], timeout: float = 600) -> Iterator[str]:
+        """
+        Send a slash command to the worker and stream its response lines.
+
+        Args:
+            slash_command: The slash command to execute
+            args: Arguments for the command
+            timeout: Seconds to wait before killing the worker
+
+        Yields:
+            JSONL lines emitted for this request. The worker does not decode
+            them: the caller must stop at the terminal result message and
+            close the generator, which marks the request as served
+
+        Raises:
+            RuntimeError: If the worker exits or times out before replying
+        """
+        self.start()
+        # Arguments are passed verbatim, as the one-shot CLI receives them in argv
+        prompt = " ".join([slash_command, *args])
+        message = {"type": "user", "message": {"role": "user", "content": prompt}}
+
+        replied = False
+        timed_out = threading.Event()
+        process = self.process
+
+        def kill_on_timeout() -> None:
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout, kill_on_timeout)
+        timer.start()
+        try:
+            self.process.stdin.write(json_utils.dumps(message) + "\n")
+            self.process.stdin.flush()
+
+            for line in self.process.stdout:
+                replied = True
+                yield line
+        except GeneratorExit:
+            # The caller stops reading once it has seen the result message
+            if replied:
+                self.requests_served += 1
+            raise
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f"Claude worker pipe closed: {e}")
+        finally:
+            timer.cancel()
+
+        # A fresh CLI that dies silently does not understand stream-json input
+        if not replied and not timed_out.is_set() and self.requests_served == 0:
+            ClaudeWorker._unsupported = True
+        raise RuntimeError("Claude worker exited or timed out before replying")
+
+    def close(self) -> None:
+        """Terminate the worker process."""
+        if self.process is None:
+            return
+
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+atexit.register(ClaudeWorker.close_all)
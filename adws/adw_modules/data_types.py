@@ -1,11 +1,11 @@
 """
 Data types for Agentic Development Workflows (ADW).
 
-Defines core data structures used across ADW modules for type safety and validation.
+Defines core data structures used across ADW modules for type safety.
 """
 
+from dataclasses import dataclass, field
 from typing import Literal, Optional, List
-from pydantic import BaseModel, Field
 
 
 # Slash Commands
@@ -30,45 +30,50 @@ ModelSet = Literal["base", "heavy"]
 IssueClass = Literal["/chore", "/bug", "/feature", "/patch", "0"]
 
 
-class AgentTemplateRequest(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class AgentTemplateRequest:
     """Request to execute an agent with a slash command template."""
 
-    agent_name: str = Field(..., description="Name of the agent executing the command")
-    slash_command: SlashCommand = Field(..., description="Slash command to execute")
-    args: List[str] = Field(default_factory=list, description="Arguments for the command")
-    adw_id: str = Field(..., description="Unique ADW workflow identifier")
-    model: Optional[ModelName] = Field(None, description="Model to use (if not using dynamic selection)")
-    working_dir: Optional[str] = Field(None, description="Working directory for execution")
+    agent_name: str  # Name of the agent executing the command
+    slash_command: SlashCommand  # Slash command to execute
+    args: List[str] = field(default_factory=list)  # Arguments for the command
+    adw_id: str  # Unique ADW workflow identifier
+    model: Optional[ModelName] = None  # Model to use (if not using dynamic selection)
+    working_dir: Optional[str] = None  # Working directory for execution
+    keep_raw_output: bool = False  # Whether to keep the complete raw JSONL output
 
 
-class AgentPromptResponse(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class AgentPromptResponse:
     """Response from agent execution."""
 
-    success: bool = Field(..., description="Whether execution was successful")
-    result: Optional[str] = Field(None, description="Result message from agent")
-    error: Optional[str] = Field(None, description="Error message if execution failed")
-    raw_output: Optional[str] = Field(None, description="Complete raw JSONL output")
-    should_retry: bool = Field(False, description="Whether this error is retryable")
+    success: bool  # Whether execution was successful
+    result: Optional[str] = None  # Result message from agent
+    error: Optional[str] = None  # Error message if execution failed
+    raw_output: Optional[str] = None  # Complete raw JSONL output
+    should_retry: bool = False  # Whether this error is retryable
 
 
-class GitHubIssue(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class GitHubIssue:
     """GitHub issue representation."""
 
-    number: int = Field(..., description="Issue number")
-    title: str = Field(..., description="Issue title")
-    body: Optional[str] = Field(None, description="Issue body/description")
-    labels: List[str] = Field(default_factory=list, description="Issue labels")
-    state: Literal["open", "closed"] = Field(..., description="Issue state")
-    html_url: str = Field(..., description="URL to the issue")
+    number: int  # Issue number
+    title: str  # Issue title
+    body: Optional[str] = None  # Issue body/description
+    labels: List[str] = field(default_factory=list)  # Issue labels
+    state: Literal["open", "closed"]  # Issue state
+    html_url: str  # URL to the issue
 
 
-class ADWMetadata(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ADWMetadata:
     """Metadata for tracking ADW workflow execution."""
 
-    adw_id: str = Field(..., description="Unique workflow identifier")
-    issue_number: Optional[int] = Field(None, description="Related GitHub issue number")
-    issue_class: Optional[IssueClass] = Field(None, description="Classified issue type")
-    branch_name: Optional[str] = Field(None, description="Git branch for this workflow")
-    plan_file: Optional[str] = Field(None, description="Path to implementation plan")
-    model_set: ModelSet = Field("base", description="Model set to use (base/heavy)")
-    all_adws: List[str] = Field(default_factory=list, description="List of ADW workflows executed")
+    adw_id: str  # Unique workflow identifier
+    issue_number: Optional[int] = None  # Related GitHub issue number
+    issue_class: Optional[IssueClass] = None  # Classified issue type
+    branch_name: Optional[str] = None  # Git branch for this workflow
+    plan_file: Optional[str] = None  # Path to implementation plan
+    model_set: ModelSet = "base"  # Model set to use (base/heavy)
+    all_adws: List[str] = field(default_factory=list)  # List of ADW workflows executed
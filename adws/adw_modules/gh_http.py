@@ -0,0 +1,250 @@
+"""
+GitHub REST and GraphQL API client for ADW workflows.
+
+Keeps one pooled keep-alive connection (HTTP/2 when h2 is installed) for all
+API calls instead of spawning the gh CLI, re-authenticating and opening a new
+TLS connection per request. Requires httpx, which is imported on first use so
+start-up does not pay for it; callers fall back to the gh CLI when the client
+is unavailable.
+"""
+
+import atexit
+import functools
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from . import json_utils
+from .subprocess_utils import run_process
+
+# Set by _import_httpx() once the client is first needed
+httpx = None
+
+API_URL = "https://api.github.com"
+
+# Issue fields needed by workflows, fetched in one GraphQL round-trip
+ISSUE_QUERY = """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {
+      title
+      body
+      labels(first: 20) { nodes { name } }
+      comments(last: 5) { nodes { body author { login } } }
+    }
+  }
+}
+"""
+
+# Epoch seconds until which the rate limit is exhausted
+_rate_limit_reset = 0.0
+
+
+@functools.lru_cache(maxsize=1)
+def get_token() -> Optional[str]:
+    """Get a GitHub token from the environment or gh CLI (resolved once)."""
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+
+    try:
+        result = run_process(["gh", "auth", "token"], timeout=15)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+    token = result.stdout.strip()
+    return token if result.returncode == 0 and token else None
+
+
+@functools.lru_cache(maxsize=1)
+def get_repo() -> Optional[str]:
+    """Get the current repository as "owner/name" via gh CLI (resolved once)."""
+    try:
+        result = run_process(
+            ["gh", "repo", "view", "--json", "nameWithOwner", "-q", ".nameWithOwner"],
+            timeout=15,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+    repo = result.stdout.strip()
+    return repo if result.returncode == 0 and repo else None
+
+
+def _import_httpx() -> bool:
+    """Import httpx into the module namespace; False if it is not installed."""
+    global httpx
+    if httpx is None:
+        try:
+            import httpx as module
+        except ImportError:
+            return False
+        httpx = module
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> Optional["httpx.Client"]:
+    """Get the shared API client, or None if httpx or a token is unavailable."""
+    if not _import_httpx():
+        return None
+
+    token = get_token()
+    if not token:
+        return None
+
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    try:
+        client = httpx.Client(base_url=API_URL, headers=headers, http2=True, timeout=30.0)
+    except ImportError:
+        # http2 needs the optional h2 package
+        client = httpx.Client(base_url=API_URL, headers=headers, timeout=30.0)
+
+    atexit.register(client.close)
+    return client
+
+
+def is_available() -> bool:
+    """Check if REST API calls can be made for the current repository."""
+    return get_client() is not None and get_repo() is not None
+
+
+def request(method: str, path: str, **kwargs: Any) -> "httpx.Response":
+    """
+    Send an API request, waiting first if the rate limit is exhausted.
+
+    A request given a timeout is not sent when the wait would exceed it.
+
+    Args:
+        method: HTTP method
+        path: API path (e.g. /repos/{owner}/{repo}/issues/1)
+        **kwargs: Passed through to httpx.Client.request
+
+    Returns:
+        Successful response
+
+    Raises:
+        httpx.HTTPError: If the request fails, returns an error status or
+            cannot be sent within its timeout
+    """
+    global _rate_limit_reset
+
+    wait = _rate_limit_reset - time.time()
+    timeout = kwargs.get("timeout")
+    if wait > 0 and timeout is not None and wait > timeout:
+        raise httpx.HTTPError(f"GitHub rate limit exhausted for {wait:.0f}s (timeout {timeout}s)")
+    if wait > 0:
+        print(f"GitHub rate limit exhausted, waiting {wait:.0f}s...", file=sys.stderr)
+        time.sleep(wait)
+
+    response = get_client().request(method, path, **kwargs)
+
+    # Back off proactively instead of retrying on 403s
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        _rate_limit_reset = float(response.headers.get("X-RateLimit-Reset", 0))
+
+    response.raise_for_status()
+    return response
+
+
+def request_json(method: str, path: str, payload: Any = None, **kwargs: Any) -> Any:
+    """
+    Send an API request with an optional JSON payload and decode the JSON reply.
+
+    Encoding and decoding go through json_utils (orjson when installed) on raw
+    bytes rather than httpx's stdlib-based helpers.
+
+    Raises:
+        httpx.HTTPError: If the request fails or returns an error status
+    """
+    if payload is not None:
+        kwargs["content"] = json_utils.dumps_bytes(payload)
+        kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
+    return json_utils.loads(request(method, path, **kwargs).content)
+
+
+def graphql(query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a GraphQL query.
+
+    Returns:
+        The response "data" object
+
+    Raises:
+        httpx.HTTPError: If the request fails or the query returns errors
+    """
+    result = request_json("POST", "/graphql", {"query": query, "variables": variables})
+    if result.get("errors"):
+        raise httpx.HTTPError(f"GraphQL error: {result['errors'][0].get('message')}")
+    return result["data"]
+
+
+def fetch_issue(issue_number: int) -> Dict[str, Any]:
+    """
+    Fetch an issue with its labels and latest comments in one GraphQL call.
+
+    Returns:
+        Flat dict with 'title', 'body', 'labels' (names) and 'comments'
+        (dicts with 'author' and 'body', oldest first)
+    """
+    owner, name = get_repo().split("/", 1)
+    data = graphql(ISSUE_QUERY, {"owner": owner, "name": name, "number": issue_number})
+    issue = data["repository"]["issue"]
+    if issue is None:
+        raise httpx.HTTPError(f"Issue #{issue_number} not found")
+    return flatten_issue(issue)
+
+
+def flatten_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a GraphQL issue or `gh issue view --json` result."""
+    labels = issue.get("labels") or []
+    comments = issue.get("comments") or []
+    # GraphQL wraps connections in "nodes"; gh CLI returns plain lists
+    if isinstance(labels, dict):
+        labels = labels.get("nodes") or []
+    if isinstance(comments, dict):
+        comments = comments.get("nodes") or []
+
+    return {
+        "title": issue.get("title") or "",
+        "body": issue.get("body") or "",
+        "labels": [label["name"] for label in labels],
+        "comments": [
+            {"author": (comment.get("author") or {}).get("login"), "body": comment.get("body") or ""}
+            for comment in comments[-5:]
+        ],
+    }
+
+
+def create_issue_comment(
+    issue_number: int,
+    body: str,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Post a comment to an issue in the current repository."""
+    return request_json(
+        "POST",
+        f"/repos/{get_repo()}/issues/{issue_number}/comments",
+        {"body": body},
+        timeout=timeout,
+    )
+
+
+def update_issue_comment(
+    comment_id: int,
+    body: str,
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Replace the body of an issue comment in the current repository."""
+    return request_json(
+        "PATCH",
+        f"/repos/{get_repo()}/issues/comments/{comment_id}",
+        {"body": body},
+        timeout=timeout,
+    )
@@ -4,15 +4,44 @@ Git operations module for ADW workflows.
 Handles branch creation, commits, and basic git operations.
 """
 
+import functools
+import re
+import string
 import subprocess
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
+
+from .subprocess_utils import run_process
+
+
+# Sanitizes ASCII in one pass: lowercases letters, turns spaces into hyphens
+# and deletes everything outside [a-z0-9-]
+_BRANCH_DESC_TRANS = str.maketrans({
+    **{chr(c): None for c in range(128) if not (chr(c).isalnum() or chr(c) in " -")},
+    **dict(zip(string.ascii_uppercase, string.ascii_lowercase)),
+    " ": "-",
+})
+
+# Characters not allowed in branch name descriptions (non-ASCII fallback)
+_BRANCH_DESC_UNSAFE = re.compile(r"[^a-z0-9-]+")
+
+# Branch name prefix for each issue class
+_BRANCH_PREFIXES = {
+    "/chore": "chore",
+    "/bug": "fix",
+    "/feature": "feat",
+    "/patch": "patch",
+}
+
+# Cached results of branch_exists, keyed by (working_dir, branch_name)
+_branch_cache: Dict[Tuple[str, str], bool] = {}
 
 
 def run_git_command(
     args: list[str],
     working_dir: Optional[Path] = None,
     check: bool = True,
+    timeout: float = 30.0,
 ) -> Tuple[int, str, str]:
     """
     Run a git command and return results.
@@ -21,25 +50,30 @@ def run_git_command(
         args: Git command arguments (without 'git' prefix)
         working_dir: Directory to run command in
         check: Whether to raise on non-zero exit code
+        timeout: Seconds to wait before killing git; 0 disables the timeout
 
     Returns:
         Tuple of (return_code, stdout, stderr)
+
+    Raises:
+        RuntimeError: If the command fails (with check) or times out
     """
     cmd = ["git"] + args
     cwd = working_dir or Path.cwd()
 
-    result = subprocess.run(
-        cmd,
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
+    try:
+        # Hooks, signing and credential helpers may hang, so kill the whole group
+        result = run_process(cmd, cwd=cwd, timeout=timeout, text=False, kill_group=True)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"Git command timed out after {timeout}s: {' '.join(cmd)}")
+
+    stdout = result.stdout.decode("utf-8", "replace").strip()
+    stderr = result.stderr.decode("utf-8", "replace").strip()
 
     if check and result.returncode != 0:
-        raise RuntimeError(f"Git command failed: {' '.join(cmd)}\n{result.stderr}")
+        raise RuntimeError(f"Git command failed: {' '.join(cmd)}\n{stderr}")
 
-    return result.returncode, result.stdout.strip(), result.stderr.strip()
+    return result.returncode, stdout, stderr
 
 
 def get_current_branch(working_dir: Optional[Path] = None) -> str:
@@ -49,13 +83,19 @@ def get_current_branch(working_dir: Optional[Path] = None) -> str:
 
 
 def branch_exists(branch_name: str, working_dir: Optional[Path] = None) -> bool:
-    """Check if a branch exists locally."""
-    returncode, _, _ = run_git_command(
-        ["rev-parse", "--verify", branch_name],
-        working_dir,
-        check=False,
-    )
-    return returncode == 0
+    """Check if a branch exists locally (cached per working directory)."""
+    key = (str(working_dir or Path.cwd()), branch_name)
+    if key not in _branch_cache:
+        returncode, _, _ = run_git_command(
+            ["rev-parse", "--verify", branch_name],
+            working_dir,
+            check=False,
+        )
+        _branch_cache[key] = returncode == 0
+    return _branch_cache[key]
+
+
+branch_exists.cache_clear = _branch_cache.clear
 
 
 def create_branch(
@@ -81,6 +121,12 @@ def create_branch(
     else:
         run_git_command(["branch", branch_name], working_dir)
 
+    # Branch set changed, drop cached lookups for this working directory
+    cwd = str(working_dir or Path.cwd())
+    for key in [key for key in _branch_cache if key[0] == cwd]:
+        del _branch_cache[key]
+    get_main_branch.cache_clear()
+
 
 def commit_changes(
     message: str,
@@ -101,19 +147,24 @@ def commit_changes(
     if add_all:
         run_git_command(["add", "-A"], working_dir)
 
-    # Check if there are changes to commit
-    returncode, _, _ = run_git_command(
-        ["diff", "--cached", "--quiet"],
+    # Create commit; git refuses when nothing is staged, so no pre-check is needed
+    returncode, stdout, stderr = run_git_command(
+        ["commit", "-m", message],
         working_dir,
         check=False,
     )
 
-    if returncode == 0:
-        # No changes to commit
-        return None
-
-    # Create commit
-    run_git_command(["commit", "-m", message], working_dir)
+    if returncode != 0:
+        # Only probe the index on failure to tell "nothing staged" from a real error
+        staged_returncode, _, _ = run_git_command(
+            ["diff", "--cached", "--quiet"],
+            working_dir,
+            check=False,
+        )
+        if staged_returncode == 0:
+            # No changes to commit
+            return None
+        raise RuntimeError(f"Git command failed: git commit -m {message}\n{stderr or stdout}")
 
     # Get commit hash
     _, commit_hash, _ = run_git_command(["rev-parse", "HEAD"], working_dir)
@@ -124,21 +175,32 @@ def get_main_branch(working_dir: Optional[Path] = None) -> str:
     """
     Detect the main branch name (main or master).
 
+    Results are cached per working directory.
+
     Returns:
         Name of the main branch
     """
+    return _detect_main_branch(str(working_dir or Path.cwd()))
+
+
+@functools.lru_cache(maxsize=16)
+def _detect_main_branch(working_dir: str) -> str:
     # Check for main
-    if branch_exists("main", working_dir):
+    if branch_exists("main", Path(working_dir)):
         return "main"
 
     # Check for master
-    if branch_exists("master", working_dir):
+    if branch_exists("master", Path(working_dir)):
         return "master"
 
     # Default to main
     return "main"
 
 
+get_main_branch.cache_clear = _detect_main_branch.cache_clear
+
+
+@functools.lru_cache(maxsize=64)
 def generate_branch_name(
     adw_id: str,
     issue_number: Optional[int],
@@ -150,6 +212,8 @@ def generate_branch_name(
 
     Format: {type}-{issue}-{adw_id}-{description}
 
+    Results are memoized, so repeated calls for a workflow are free.
+
     Args:
         adw_id: Workflow identifier
         issue_number: Optional issue number
@@ -160,18 +224,13 @@ def generate_branch_name(
         Generated branch name
     """
     # Map issue class to prefix
-    prefix_map = {
-        "/chore": "chore",
-        "/bug": "fix",
-        "/feature": "feat",
-        "/patch": "patch",
-    }
-    prefix = prefix_map.get(issue_class, "chore")
-
-    # Clean description (lowercase, replace spaces with hyphens)
-    clean_desc = description.lower().replace(" ", "-")
-    # Remove special characters
-    clean_desc = "".join(c for c in clean_desc if c.isalnum() or c == "-")
+    prefix = _BRANCH_PREFIXES.get(issue_class, "chore")
+
+    # Clean description (lowercase, replace spaces with hyphens, remove special characters)
+    clean_desc = description.translate(_BRANCH_DESC_TRANS)
+    # Non-ASCII characters pass through translate untouched; strip them too
+    if not clean_desc.isascii():
+        clean_desc = _BRANCH_DESC_UNSAFE.sub("", clean_desc)
     # Limit length
     clean_desc = clean_desc[:30]
 
@@ -183,37 +242,32 @@ def generate_branch_name(
 
 
 def has_uncommitted_changes(working_dir: Optional[Path] = None) -> bool:
-    """Check if there are uncommitted changes."""
-    returncode, _, _ = run_git_command(
-        ["diff", "--quiet"],
+    """Check if there are uncommitted (staged or unstaged) changes to tracked files."""
+    _, stdout, _ = run_git_command(
+        ["status", "--porcelain", "--untracked-files=no"],
         working_dir,
-        check=False,
     )
-    has_unstaged = returncode != 0
+    return bool(stdout)
 
-    returncode, _, _ = run_git_command(
-        ["diff", "--cached", "--quiet"],
-        working_dir,
-        check=False,
-    )
-    has_staged = returncode != 0
 
-    return has_unstaged or has_staged
-
-
-def push_branch(branch_name: str, working_dir: Optional[Path] = None) -> Tuple[bool, Optional[str]]:
+def push_branch(
+    branch_name: str,
+    working_dir: Optional[Path] = None,
+    timeout: float = 300.0,
+) -> Tuple[bool, Optional[str]]:
     """
     Push branch to remote.
 
     Args:
         branch_name: Name of branch to push
         working_dir: Directory to run command in
+        timeout: Seconds to wait for the push; 0 disables the timeout
 
     Returns:
         Tuple of (success, error_message)
     """
     try:
-        run_git_command(["push", "-u", "origin", branch_name], working_dir)
+        run_git_command(["push", "-u", "origin", branch_name], working_dir, timeout=timeout)
         return True, None
     except RuntimeError as e:
         return False, str(e)
@@ -1,14 +1,50 @@
 """GitHub operations for ADW workflows."""
 
+import re
 import subprocess
 import sys
+import threading
+from typing import List, Optional, Tuple
+
+from . import gh_http, json_utils
+from .subprocess_utils import run_process
 
 # Bot identifier to mark ADW comments
 ADW_BOT_IDENTIFIER = "[ADW-BOT]"
 
+# Comment id at the end of the URL printed by `gh issue comment`
+_COMMENT_ID_RE = re.compile(r"#issuecomment-(\d+)")
+
+
+def make_issue_comment(issue_number: str, comment: str, timeout: float = 15.0) -> Optional[int]:
+    """
+    Post a comment to a GitHub issue via the REST API, falling back to gh CLI.
+
+    A timeout of 0 disables the limit.
+
+    Returns: ID of the new comment, or None if posting failed or the ID is unknown
+    """
+    return _post_issue_comment(issue_number, comment, timeout)[1]
+
+
+def _post_issue_comment(
+    issue_number: str,
+    comment: str,
+    timeout: float = 15.0,
+) -> Tuple[bool, Optional[int]]:
+    """
+    Post a comment and report whether it was posted separately from its ID.
+
+    Returns: (posted, comment_id); comment_id may be None even when posted
+    """
+    if gh_http.is_available():
+        try:
+            return True, gh_http.create_issue_comment(int(issue_number), comment, timeout=timeout or None)["id"]
+        except Exception as e:
+            # Don't raise, just warn - comments are nice-to-have
+            print(f"Warning: Failed to post comment: {e}", file=sys.stderr)
+        return False, None
 
-def make_issue_comment(issue_number: str, comment: str) -> None:
-    """Post a comment to a GitHub issue using gh CLI."""
     cmd = [
         "gh",
         "issue",
@@ -19,16 +55,176 @@ def make_issue_comment(issue_number: str, comment: str) -> None:
     ]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run_process(cmd, timeout=timeout, kill_group=True)
 
         if result.returncode != 0:
             print(f"Warning: Failed to post comment: {result.stderr}", file=sys.stderr)
             # Don't exit, just warn - comments are nice-to-have
+            return False, None
+
+        match = _COMMENT_ID_RE.search(result.stdout)
+        if match:
+            return True, int(match.group(1))
+        return True, find_issue_comment_id(issue_number, comment, timeout)
 
+    except subprocess.TimeoutExpired:
+        print(f"Warning: Timed out posting comment after {timeout}s", file=sys.stderr)
     except FileNotFoundError:
         print("Warning: gh CLI not found, skipping comment", file=sys.stderr)
     except Exception as e:
         print(f"Warning: Failed to post comment: {e}", file=sys.stderr)
+    return False, None
+
+
+def find_issue_comment_id(issue_number: str, comment: str, timeout: float = 15.0) -> Optional[int]:
+    """
+    Look up the ID of the newest comment on an issue with the given body via gh CLI.
+
+    A timeout of 0 disables the limit.
+
+    Returns: ID of the matching comment, or None if it cannot be found
+    """
+    cmd = ["gh", "issue", "view", issue_number, "--json", "comments"]
+
+    try:
+        result = run_process(cmd, timeout=timeout, kill_group=True)
+        if result.returncode != 0:
+            return None
+
+        comments = json_utils.loads(result.stdout).get("comments") or []
+        for item in reversed(comments):
+            if item.get("body", "").strip() == comment.strip():
+                match = _COMMENT_ID_RE.search(item.get("url", ""))
+                return int(match.group(1)) if match else None
+    except Exception as e:
+        print(f"Warning: Failed to look up comment id: {e}", file=sys.stderr)
+    return None
+
+
+def update_issue_comment(comment_id: int, comment: str, timeout: float = 15.0) -> bool:
+    """
+    Replace the body of an issue comment via the REST API, falling back to gh CLI.
+
+    A timeout of 0 disables the limit.
+
+    Returns: True if the comment was updated
+    """
+    if gh_http.is_available():
+        try:
+            gh_http.update_issue_comment(comment_id, comment, timeout=timeout or None)
+            return True
+        except Exception as e:
+            print(f"Warning: Failed to update comment: {e}", file=sys.stderr)
+            return False
+
+    cmd = [
+        "gh",
+        "api",
+        "--method",
+        "PATCH",
+        f"repos/{{owner}}/{{repo}}/issues/comments/{comment_id}",
+        "-f",
+        f"body={comment}",
+    ]
+
+    try:
+        result = run_process(cmd, timeout=timeout, kill_group=True)
+
+        if result.returncode != 0:
+            print(f"Warning: Failed to update comment: {result.stderr}", file=sys.stderr)
+            return False
+        return True
+
+    except subprocess.TimeoutExpired:
+        print(f"Warning: Timed out updating comment after {timeout}s", file=sys.stderr)
+    except FileNotFoundError:
+        print("Warning: gh CLI not found, skipping comment", file=sys.stderr)
+    except Exception as e:
+        print(f"Warning: Failed to update comment: {e}", file=sys.stderr)
+    return False
+
+
+class StickyStatusComment:
+    """
+    One issue comment that collects workflow status updates.
+
+    The comment is created by the first flush and edited in place afterwards,
+    so watchers get a single notification. If the comment was posted but its ID
+    cannot be determined, later updates are dropped rather than posted as new
+    comments. Appends arriving within `debounce`
+    seconds of each other are coalesced into one edit. Call shutdown() before
+    exiting to flush pending updates.
+    """
+
+    def __init__(self, issue_number: str, background: bool = True, debounce: float = 0.25):
+        """
+        Initialize sticky status comment.
+
+        Args:
+            issue_number: Issue to comment on
+            background: Flush from a timer thread; False updates synchronously
+            debounce: Seconds to wait for further appends before flushing
+        """
+        self.issue_number = issue_number
+        self.comment_id: Optional[int] = None
+        self._id_unknown = False  # posted, but the comment cannot be edited
+        self.background = background
+        self.debounce = debounce
+        self._sections: List[str] = []
+        self._flushed = 0  # number of sections in the posted body
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def create(self, initial_text: str) -> Optional[int]:
+        """Post the comment now with its first section and return its ID."""
+        with self._lock:
+            self._sections.append(initial_text)
+        self.flush()
+        return self.comment_id
+
+    def append(self, section: str) -> None:
+        """Add a section and schedule an edit of the comment."""
+        with self._lock:
+            self._sections.append(section)
+            if self.background:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.debounce, self.flush)
+                    self._timer.start()
+                return
+
+        self.flush()
+
+    def flush(self) -> None:
+        """Post or edit the comment with every section appended so far."""
+        with self._flush_lock:
+            with self._lock:
+                self._timer = None
+                count = len(self._sections)
+                if count == self._flushed:
+                    return
+                body = "\n\n".join(self._sections)
+
+            if self._id_unknown:
+                return
+            if self.comment_id is None:
+                posted, self.comment_id = _post_issue_comment(self.issue_number, body)
+                if posted and self.comment_id is None:
+                    print("Warning: Status comment ID unknown, skipping further updates", file=sys.stderr)
+                    self._id_unknown = True
+            else:
+                posted = update_issue_comment(self.comment_id, body)
+
+            if posted:
+                self._flushed = count
+
+    def shutdown(self) -> None:
+        """Cancel any pending debounce and flush immediately."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
 
 
 def format_issue_message(adw_id: str, agent_name: str, message: str) -> str:
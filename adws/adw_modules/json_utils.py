@@ -0,0 +1,105 @@
+"""
+JSON helpers for ADW modules.
+
+Uses orjson (and pysimdjson for field peeking) when installed and falls back
+to the standard library.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON bytes."""
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize an object to a JSON string."""
+    return dumps_bytes(obj, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+
+class FieldParser:
+    """
+    Decode only selected top-level fields of JSON objects.
+
+    With pysimdjson installed, one parser (and its internal buffers) is reused
+    for every document and only the requested fields are materialized, so large
+    unrelated subtrees are never turned into Python objects. A parser must not
+    be shared between threads.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self._parser = simdjson.Parser() if simdjson is not None else None
+
+    def parse(self, data: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Parse a document and return the requested fields that are present.
+
+        Returns:
+            Dict of the selected fields, or None if the document is not an object
+
+        Raises:
+            JSONDecodeError: If the document is not valid JSON
+        """
+        if self._parser is not None:
+            raw = data.encode("utf-8") if isinstance(data, str) else data
+            try:
+                return self._peek(raw)
+            except ValueError:
+                pass  # Let the standard decoder produce a proper error
+
+        document = loads(data)
+        if not isinstance(document, dict):
+            return None
+        return {key: document[key] for key in self.fields if key in document}
+
+    def _peek(self, raw: bytes) -> Optional[Dict[str, Any]]:
+        # Proxies must not outlive this call, or the parser cannot be reused
+        document = self._parser.parse(raw)
+        if not isinstance(document, simdjson.Object):
+            return None
+
+        fields: Dict[str, Any] = {}
+        for key in self.fields:
+            if key in document:
+                value = document[key]
+                if isinstance(value, simdjson.Object):
+                    value = value.as_dict()
+                elif isinstance(value, simdjson.Array):
+                    value = value.as_list()
+                fields[key] = value
+        return fields
@@ -0,0 +1,90 @@
+"""
+On-disk cache of agent responses for ADW workflows.
+
+Responses are stored per workflow in
+$XDG_CACHE_HOME/adw/llm_cache/{adw_id}/{sha256}.json (~/.cache by default),
+outside the project so `git add -A` never commits them. Re-running or resuming
+a workflow on identical inputs skips the Claude CLI call.
+
+Only /classify_issue is cached, because its response is its whole output. The
+planner commands write the plan file as a side effect, /implement edits files
+and /commit depends on the working tree, so these always run.
+
+Set ADW_LLM_CACHE=0 to disable the cache.
+"""
+
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import json_utils
+from .data_types import AgentTemplateRequest
+
+# Commands whose responses may be served from the cache
+CACHEABLE_COMMANDS = frozenset({"/classify_issue"})
+
+# Entries older than this are ignored
+TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def is_enabled() -> bool:
+    """Check if the cache is enabled via the environment."""
+    return os.environ.get("ADW_LLM_CACHE", "1") != "0"
+
+
+def is_cacheable(request: AgentTemplateRequest) -> bool:
+    """Check if a request's response may be cached."""
+    return is_enabled() and request.slash_command in CACHEABLE_COMMANDS
+
+
+def make_key(request: AgentTemplateRequest) -> str:
+    """
+    Compute the cache key for a request.
+
+    Arguments naming existing files (such as the issue file) contribute their
+    contents, so editing the file invalidates the entry. The project directory
+    is part of the key since the cache is shared between projects.
+    """
+    digest = hashlib.sha256(json_utils.dumps_bytes({
+        "cwd": str(Path.cwd()),
+        "slash": request.slash_command,
+        "args": request.args,
+        "agent": request.agent_name,
+        "model": request.model,
+    }, sort_keys=True))
+
+    for arg in request.args:
+        path = Path(arg)
+        if len(arg) < 4096 and path.is_file():
+            digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+def _cache_path(adw_id: str, key: str) -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "adw" / "llm_cache" / adw_id / f"{key}.json"
+
+
+def lookup(adw_id: str, key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached response for a key, or None on a miss."""
+    path = _cache_path(adw_id, key)
+    try:
+        if time.time() - path.stat().st_mtime > TTL_SECONDS:
+            return None
+        return json_utils.loads(path.read_bytes())
+    except (OSError, json_utils.JSONDecodeError):
+        return None
+
+
+def store(adw_id: str, key: str, response: Dict[str, Any]) -> None:
+    """Cache a response; failures only print a warning."""
+    path = _cache_path(adw_id, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(json_utils.dumps_bytes(response, indent=True))
+    except OSError as e:
+        print(f"Warning: Failed to cache response: {e}", file=sys.stderr)
@@ -4,11 +4,14 @@ State management module for ADW workflows.
 Provides persistent file-based state storage and transient piping capabilities.
 """
 
-import json
+import os
 import sys
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Set
 
+from . import json_utils
 from .data_types import ADWMetadata, ModelSet
 
 
@@ -16,17 +19,25 @@ class ADWState:
     """
     Manages persistent and transient state for ADW workflows.
 
-    State is stored in: agents/{adw_id}/adw_state.json
+    State is stored in agents/{adw_id}/ as:
+    - adw_state.json: compacted snapshot
+    - adw_state.log: append-only JSONL of changes made since the snapshot
 
     Supports two modes:
     1. Persistent: save() and load() from filesystem
     2. Transient: to_stdout() and from_stdin() for piping between scripts
+
+    Changes must go through set()/update() to be picked up by save(), which
+    appends only the changed keys to the log. Once the log grows past
+    LOG_COMPACT_BYTES it is folded into a new snapshot. Writes are fsynced only
+    when ADW_DURABLE=1.
     """
 
     # Core fields that are persisted
     CORE_FIELDS = {
         "adw_id",
         "issue_number",
+        "issue_file",
         "branch_name",
         "plan_file",
         "issue_class",
@@ -38,6 +49,9 @@ class ADWState:
         "frontend_port",
     }
 
+    # Log size that triggers compaction into the snapshot
+    LOG_COMPACT_BYTES = 64 * 1024
+
     def __init__(self, adw_id: str, project_root: Optional[Path] = None):
         """
         Initialize ADW state manager.
@@ -50,12 +64,20 @@ class ADWState:
         self.project_root = project_root or Path.cwd()
         self.state_dir = self.project_root / "agents" / adw_id
         self.state_file = self.state_dir / "adw_state.json"
+        self.log_file = self.state_dir / "adw_state.log"
         self._data: Dict[str, Any] = {"adw_id": adw_id}
+        self._dirty_keys: Set[str] = {"adw_id"}
+        self._batch_depth = 0
+        self._batch_updated_by: Optional[str] = None
 
         # Load existing state if available
-        if self.state_file.exists():
+        if self.exists():
             self.load()
 
+    def exists(self) -> bool:
+        """Check if state has been persisted for this workflow."""
+        return self.state_file.exists() or self.log_file.exists()
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get a value from state."""
         return self._data.get(key, default)
@@ -63,19 +85,52 @@ class ADWState:
     def set(self, key: str, value: Any) -> None:
         """Set a value in state."""
         self._data[key] = value
+        self._dirty_keys.add(key)
 
     def update(self, **kwargs) -> None:
         """Update multiple values in state."""
         self._data.update(kwargs)
+        self._dirty_keys.update(kwargs)
+
+    @contextmanager
+    def batch(self, updated_by: Optional[str] = None) -> Iterator["ADWState"]:
+        """
+        Defer saves until the block exits, then write all changes at once.
+
+        Changes made before an exception (or sys.exit) are still saved.
+
+        Args:
+            updated_by: Optional identifier of who/what updated the state
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                batch_updated_by, self._batch_updated_by = self._batch_updated_by, None
+                self.save(updated_by or batch_updated_by)
 
     def load(self) -> None:
-        """Load state from filesystem."""
-        if not self.state_file.exists():
+        """Load the snapshot from filesystem and replay the change log."""
+        if not self.exists():
             return
 
         try:
-            with open(self.state_file, "r") as f:
-                self._data = json.load(f)
+            data: Dict[str, Any] = {"adw_id": self.adw_id}
+            if self.state_file.exists():
+                data = json_utils.loads(self.state_file.read_bytes())
+
+            if self.log_file.exists():
+                for line in self.log_file.read_bytes().splitlines():
+                    try:
+                        entry = json_utils.loads(line)
+                        data[entry["k"]] = entry["v"]
+                    except (json_utils.JSONDecodeError, KeyError, TypeError):
+                        continue  # Torn line from an interrupted write
+
+            self._data = data
+            self._dirty_keys.clear()
         except Exception as e:
             print(f"Warning: Failed to load state: {e}", file=sys.stderr)
 
@@ -83,27 +138,88 @@ class ADWState:
         """
         Save state to filesystem.
 
+        Appends one log line per key changed since the last load/save with a
+        single O_APPEND write; no-op when nothing changed. Inside batch() the
+        write is deferred until the batch exits.
+
         Args:
             updated_by: Optional identifier of who/what updated the state
         """
-        # Ensure directory exists
-        self.state_dir.mkdir(parents=True, exist_ok=True)
+        if self._batch_depth:
+            self._batch_updated_by = updated_by or self._batch_updated_by
+            return
 
         # Add metadata
-        if updated_by:
-            self._data["last_updated_by"] = updated_by
+        if updated_by and self._data.get("last_updated_by") != updated_by:
+            self.set("last_updated_by", updated_by)
+
+        if not self._dirty_keys:
+            return
+
+        records = b"".join(
+            json_utils.dumps_bytes({"k": key, "v": self._data[key]}) + b"\n"
+            for key in sorted(self._dirty_keys)
+        )
 
         # Write state
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(self._data, f, indent=2)
+            # Ensure directory exists
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+
+            fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, records)
+                if _durable():
+                    os.fsync(fd)
+                log_size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+            if log_size > self.LOG_COMPACT_BYTES:
+                self.compact()
         except Exception as e:
             print(f"Error: Failed to save state: {e}", file=sys.stderr)
             sys.exit(1)
 
+        self._dirty_keys.clear()
+
+    def compact(self) -> None:
+        """
+        Fold the change log into a new snapshot and truncate the log.
+
+        The snapshot is written to a temporary file and renamed over the old
+        one, so a crash never leaves partial state behind. A crash before the
+        log is truncated is harmless: replaying it onto the new snapshot gives
+        the same state.
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+        content = json_utils.dumps_bytes(self._data, indent=True, sort_keys=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.state_dir,
+            prefix=".adw_state.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            f.write(content)
+            if _durable():
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            os.replace(f.name, self.state_file)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+        if self.log_file.exists():
+            os.truncate(self.log_file, 0)
+
     def to_stdout(self) -> None:
         """Output state as JSON to stdout for piping to next script."""
-        print(json.dumps(self._data))
+        # Flush pending text output so it stays ahead of the raw bytes
+        sys.stdout.flush()
+        sys.stdout.buffer.write(json_utils.dumps_bytes(self._data) + b"\n")
+        sys.stdout.buffer.flush()
 
     @classmethod
     def from_stdin(cls, adw_id: str, project_root: Optional[Path] = None) -> "ADWState":
@@ -120,9 +236,10 @@ class ADWState:
         state = cls(adw_id, project_root)
 
         try:
-            piped_data = json.load(sys.stdin)
-            state._data.update(piped_data)
-        except json.JSONDecodeError:
+            raw = sys.stdin.buffer.read()
+            if raw.strip():
+                state.update(**json_utils.loads(raw))
+        except json_utils.JSONDecodeError:
             pass  # No piped data, use default
 
         return state
@@ -152,6 +269,11 @@ class ADWState:
         )
 
 
+def _durable() -> bool:
+    """Whether state writes should be fsynced (ADW_DURABLE=1)."""
+    return os.environ.get("ADW_DURABLE", "0") == "1"
+
+
 def ensure_adw_id(provided_id: Optional[str] = None) -> str:
     """
     Ensure we have a valid ADW ID.
@@ -167,7 +289,7 @@ def ensure_adw_id(provided_id: Optional[str] = None) -> str:
     """
     if provided_id:
         state = ADWState(provided_id)
-        if state.state_file.exists():
+        if state.exists():
             return provided_id
 
     # Generate new ID (8 random hex characters)
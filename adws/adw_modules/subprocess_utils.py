@@ -0,0 +1,82 @@
+"""
+Subprocess helpers for ADW modules.
+
+Runs external commands (git, gh) with a bounded wall time.
+
+Commands that may start helpers of their own (git hooks, GPG signing, LFS
+filters, credential prompts) should run with kill_group, so a timeout kills
+every process holding the output pipes. Other commands are launched with
+posix_spawn where CPython allows it: executable given as a path, close_fds
+False, no cwd and no new session. Since Python 3.4 descriptors are
+non-inheritable by default, so close_fds=False does not leak them.
+"""
+
+import functools
+import os
+import shutil
+import signal
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Union
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_executable(name: str) -> str:
+    """Resolve a command name to its full path (resolved once per process)."""
+    return shutil.which(name) or name
+
+
+def run_process(
+    cmd: List[str],
+    cwd: Optional[Union[str, Path]] = None,
+    timeout: Optional[float] = None,
+    text: bool = True,
+    kill_group: bool = False,
+) -> subprocess.CompletedProcess:
+    """
+    Run a command and capture its output.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Directory to run command in (prevents posix_spawn when set)
+        timeout: Seconds to wait; 0 or None means no timeout
+        text: Decode output as text; pass False to get raw bytes
+        kill_group: Run in a new session and, on timeout, kill the whole
+            process group (e.g. hooks and credential prompts) instead of just
+            the command; this prevents posix_spawn
+
+    Returns:
+        Completed process with stdout and stderr as str (or bytes)
+
+    Raises:
+        subprocess.TimeoutExpired: If the command did not finish in time
+    """
+    process = subprocess.Popen(
+        [resolve_executable(cmd[0])] + cmd[1:],
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=text,
+        close_fds=False,
+        start_new_session=kill_group,
+    )
+
+    try:
+        stdout, stderr = process.communicate(timeout=timeout or None)
+    except subprocess.TimeoutExpired:
+        if kill_group:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.communicate()
+            raise
+
+        process.kill()
+        # A surviving child may still hold the pipes; don't wait for it
+        try:
+            process.communicate(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.stdout.close()
+            process.stderr.close()
+            process.wait()
+        raise
+
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
@@ -1,90 +1,83 @@
-#!/usr/bin/env python3
 """
 ADW Plan + Build - Basic workflow for planning and implementing changes.
 
 Usage:
-    uv run adw_plan_build.py <issue_number> [adw_id]
+    uv run python -m adws.adw_plan_build <issue_number> [adw_id] [--no-parallel] [--no-cache]
 
 Example:
-    uv run adw_plan_build.py 123
-    uv run adw_plan_build.py 123 abc12345
+    uv run python -m adws.adw_plan_build 123
+    uv run python -m adws.adw_plan_build 123 abc12345
+
+Use --no-parallel to update the status comment synchronously instead of from a
+background thread (useful for debugging).
+Use --no-cache to ignore cached agent responses (same as ADW_LLM_CACHE=0).
 """
 
+from __future__ import annotations
+
+import os
+import re
 import sys
-import json
-import subprocess
 from pathlib import Path
 
-# Add adw_modules to path
-sys.path.insert(0, str(Path(__file__).parent / "adw_modules"))
-
-from adw_modules import (
+from .adw_modules import (
     ADWState,
     ensure_adw_id,
     AgentTemplateRequest,
     prompt_claude_code_with_retry,
     create_branch,
     commit_changes,
+    get_current_branch,
     generate_branch_name,
     push_branch,
     create_pull_request,
 )
-from adw_modules.github import make_issue_comment, format_issue_message
+from .adw_modules.classifier import classify_issue
+from .adw_modules.github import StickyStatusComment, format_issue_message
+from .adw_modules.subprocess_utils import run_process
+from .adw_modules import gh_http, json_utils
+
+
+# Plan file path in an agent response: backtick-wrapped paths take priority
+# over bare ones, which may just be mentioned in passing
+_QUOTED_PLAN_PATH_RE = re.compile(r"`(specs/plan-[^`]+\.md)`")
+_PLAN_PATH_RE = re.compile(r"specs/plan-\S+\.md")
+
+# Any spec file path, used when no plan path is found
+_SPEC_PATH_RE = re.compile(r"specs/[^\s`]+\.md")
 
 
 def fetch_github_issue(issue_number: int) -> dict:
     """
-    Fetch issue from GitHub using gh CLI.
+    Fetch issue from GitHub via one GraphQL call, falling back to gh CLI.
 
-    Returns: dict with 'title' and 'body' keys
+    Returns: dict with 'title', 'body', 'labels' and 'comments' keys
     """
-    try:
-        result = subprocess.run(
-            ["gh", "issue", "view", str(issue_number), "--json", "title,body"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        issue_data = json.loads(result.stdout)
-        return issue_data
-    except subprocess.CalledProcessError as e:
-        print(f"Error fetching issue from GitHub: {e.stderr}")
+    if gh_http.is_available():
+        try:
+            return gh_http.fetch_issue(issue_number)
+        except gh_http.httpx.HTTPError as e:
+            print(f"Error fetching issue from GitHub: {e}")
+            sys.exit(1)
+
+    # Keep stdout as bytes: the JSON decoder takes them directly and stderr is
+    # only decoded when reporting an error
+    result = run_process(
+        ["gh", "issue", "view", str(issue_number), "--json", "title,body,labels,comments"],
+        text=False,
+    )
+    if result.returncode != 0:
+        print(f"Error fetching issue from GitHub: {result.stderr.decode('utf-8', errors='replace')}")
         print("Make sure you have gh CLI installed and authenticated")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+
+    try:
+        return gh_http.flatten_issue(json_utils.loads(result.stdout))
+    except json_utils.JSONDecodeError as e:
         print(f"Error parsing GitHub issue data: {e}")
         sys.exit(1)
 
 
-def classify_issue(issue_content: str, adw_id: str) -> str:
-    """
-    Classify issue into command type based on keywords.
-
-    Returns: /bug, /chore, or /feature
-    """
-    content_lower = issue_content.lower()
-
-    # Feature indicators (check FIRST - most common)
-    feature_keywords = ['implement', 'add', 'create', 'feature', 'new', 'build',
-                       'generation', 'dashboard', 'analytics', 'form', 'component']
-    if any(keyword in content_lower for keyword in feature_keywords):
-        return "/feature"
-
-    # Bug indicators
-    bug_keywords = ['fix bug', 'bug:', 'error:', 'broken', 'crash', 'failing test']
-    if any(keyword in content_lower for keyword in bug_keywords):
-        return "/bug"
-
-    # Chore indicators
-    chore_keywords = ['refactor', 'update deps', 'upgrade', 'dependency',
-                      'setup', 'configure', 'config', 'install', 'architecture', 'scaffold']
-    if any(keyword in content_lower for keyword in chore_keywords):
-        return "/chore"
-
-    # Default to feature
-    return "/feature"
-
-
 def extract_plan_path(text: str) -> str:
     """
     Extract plan file path from Claude's response.
@@ -94,50 +87,52 @@ def extract_plan_path(text: str) -> str:
     - `specs/plan-xxx.md`
     - **Plan File:** `specs/plan-xxx.md`
     """
-    import re
-
-    # Try to find specs/plan-*.md pattern
-    patterns = [
-        r'`(specs/plan-[^`]+\.md)`',  # Backtick wrapped
-        r'(specs/plan-\S+\.md)',  # Plain path
-        r'Plan File.*?`(specs/plan-[^`]+\.md)`',  # After "Plan File:"
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(1)
-
-    # If no pattern matches, check if any line contains specs/
-    lines = text.split('\n')
-    for line in lines:
-        if 'specs/' in line and '.md' in line:
-            # Extract just the path
-            match = re.search(r'(specs/[^\s`]+\.md)', line)
-            if match:
-                return match.group(1)
+    # Try to find a backtick-wrapped specs/plan-*.md path, then a bare one
+    match = _QUOTED_PLAN_PATH_RE.search(text)
+    if match:
+        return match.group(1)
+
+    match = _PLAN_PATH_RE.search(text)
+    if match:
+        return match.group(0)
+
+    # If no pattern matches, look for any specs/*.md path
+    match = _SPEC_PATH_RE.search(text)
+    if match:
+        return match.group(0)
 
     # Last resort: return the text as-is and let it fail with better error
     return text.strip()
 
 
-def create_plan(issue_number: int, adw_id: str, issue_class: str, issue_content: str) -> str:
+def save_issue_file(state: ADWState, issue_number: int, title: str, body: str) -> str:
     """
-    Create implementation plan.
+    Write the issue once to agents/{adw_id}/issue.json.
 
-    Returns: Path to plan file
+    Agents receive this path instead of the full issue text in argv.
+
+    Returns: Path to issue file, relative to the project root
     """
-    # Prepare issue JSON
-    issue_json = json.dumps({
+    issue_path = state.state_dir / "issue.json"
+    issue_path.parent.mkdir(parents=True, exist_ok=True)
+    issue_path.write_bytes(json_utils.dumps_bytes({
         "number": issue_number,
-        "title": f"Issue #{issue_number}",
-        "body": issue_content,
-    })
+        "title": title,
+        "body": body,
+    }, indent=True))
+    return str(issue_path.relative_to(state.project_root))
+
+
+def create_plan(issue_number: int, adw_id: str, issue_class: str, issue_file: str) -> str:
+    """
+    Create implementation plan.
 
+    Returns: Path to plan file
+    """
     request = AgentTemplateRequest(
         agent_name="planner",
         slash_command=issue_class,
-        args=[str(issue_number), adw_id, issue_json],
+        args=[str(issue_number), adw_id, issue_file],
         adw_id=adw_id,
     )
 
@@ -153,14 +148,13 @@ def create_plan(issue_number: int, adw_id: str, issue_class: str, issue_content:
 
 def implement_plan(plan_file: str, adw_id: str) -> None:
     """Execute implementation plan."""
-    # Read plan content
-    plan_path = Path(plan_file)
-    if not plan_path.exists():
+    # Read plan content; one open instead of a stat followed by an open
+    try:
+        plan_content = Path(plan_file).read_text()
+    except FileNotFoundError:
         print(f"Error: Plan file not found: {plan_file}")
         sys.exit(1)
 
-    plan_content = plan_path.read_text()
-
     request = AgentTemplateRequest(
         agent_name="implementor",
         slash_command="/implement",
@@ -176,12 +170,12 @@ def implement_plan(plan_file: str, adw_id: str) -> None:
     print(f"Implementation complete: {response.result}")
 
 
-def create_commit(agent_name: str, issue_class: str, issue_content: str, adw_id: str) -> str:
+def create_commit(agent_name: str, issue_class: str, issue_file: str, adw_id: str) -> str:
     """Create git commit."""
     request = AgentTemplateRequest(
         agent_name=agent_name,
         slash_command="/commit",
-        args=[agent_name, issue_class, issue_content],
+        args=[agent_name, issue_class, issue_file],
         adw_id=adw_id,
     )
 
@@ -195,12 +189,17 @@ def create_commit(agent_name: str, issue_class: str, issue_content: str, adw_id:
 
 def main():
     """Main workflow execution."""
-    if len(sys.argv) < 2:
-        print("Usage: uv run adw_plan_build.py <issue_number> [adw_id]")
+    parallel = "--no-parallel" not in sys.argv
+    if "--no-cache" in sys.argv:
+        os.environ["ADW_LLM_CACHE"] = "0"
+    args = [arg for arg in sys.argv[1:] if arg not in ("--no-parallel", "--no-cache")]
+
+    if len(args) < 1:
+        print("Usage: uv run python -m adws.adw_plan_build <issue_number> [adw_id] [--no-parallel] [--no-cache]")
         sys.exit(1)
 
-    issue_number = int(sys.argv[1])
-    provided_adw_id = sys.argv[2] if len(sys.argv) > 2 else None
+    issue_number = int(args[0])
+    provided_adw_id = args[1] if len(args) > 1 else None
 
     # Fetch issue from GitHub
     print(f"\n📥 Fetching issue #{issue_number} from GitHub...")
@@ -208,6 +207,9 @@ def main():
     issue_title = issue_data.get("title", "")
     issue_body = issue_data.get("body", "")
     issue_content = f"{issue_title}\n\n{issue_body}"
+    # Derived once and reused by the classifier and branch naming
+    content_lower = issue_content.lower()
+    content_slug = issue_content[:50]
 
     print(f"✅ Issue fetched: {issue_title}")
     print(f"\n📋 Issue content:\n{'-' * 60}\n{issue_content}\n{'-' * 60}\n")
@@ -218,118 +220,100 @@ def main():
     adw_id = ensure_adw_id(provided_adw_id)
     print(f"📋 ADW ID: {adw_id}")
 
-    # Initialize state
-    state = ADWState(adw_id)
-    state.update(issue_number=issue_number)
-    state.save("adw_plan_build")
+    # Report progress in one issue comment, edited in the background as steps finish
+    status = StickyStatusComment(str(issue_number), background=parallel)
+    status.append(format_issue_message(adw_id, "ops", "✅ Starting ADW Plan + Build workflow"))
 
-    # Post initial comment
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "ops", "✅ Starting ADW Plan + Build workflow")
-    )
+    # Initialize state; setup results are saved together when the batch exits
+    state = ADWState(adw_id)
+    with state.batch("adw_plan_build"):
+        issue_file = save_issue_file(state, issue_number, issue_title, issue_body)
+        state.update(issue_number=issue_number, issue_file=issue_file)
+
+        # Step 1: Classify issue
+        print("\n🔍 Classifying issue...")
+        issue_class = classify_issue(issue_content, issue_file, adw_id, content_lower)
+        print(f"✅ Classification: {issue_class}")
+
+        # A resumed workflow keeps the branch it already created
+        branch_name = state.get("branch_name") or generate_branch_name(
+            adw_id, issue_number, content_slug, issue_class
+        )
 
-    # Step 1: Classify issue
-    print("\n🔍 Classifying issue...")
-    issue_class = classify_issue(issue_content, adw_id)
-    print(f"✅ Classification: {issue_class}")
+        state.update(issue_class=issue_class)
 
-    state.update(issue_class=issue_class)
-    state.save("adw_plan_build")
+        status.append(format_issue_message(adw_id, "classifier", f"✅ Issue classified as: {issue_class}"))
 
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "classifier", f"✅ Issue classified as: {issue_class}")
-    )
-
-    # Step 2: Generate branch name and create branch
-    print("\n🌿 Creating branch...")
-    branch_name = generate_branch_name(adw_id, issue_number, issue_content[:50], issue_class)
-    create_branch(branch_name, checkout=True)
-    print(f"✅ Branch created: {branch_name}")
+        # Step 2: Create branch (nothing to do when resuming on it). The plan
+        # is created afterwards: overlapping the two only saves the moment
+        # `git checkout -b` takes, and a failed branch step would otherwise
+        # leave the planner running and its plan file on the original branch
+        print("\n🌿 Creating branch...")
+        if state.get("branch_name") == branch_name and get_current_branch() == branch_name:
+            print(f"✅ Already on branch: {branch_name}")
+        else:
+            create_branch(branch_name, checkout=True)
+            print(f"✅ Branch created: {branch_name}")
 
-    state.update(branch_name=branch_name)
-    state.save("adw_plan_build")
+        state.update(branch_name=branch_name)
 
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "ops", f"✅ Working on branch: `{branch_name}`")
-    )
+        status.append(format_issue_message(adw_id, "ops", f"✅ Working on branch: `{branch_name}`"))
 
     # Step 3: Create plan
     print("\n📝 Creating implementation plan...")
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "planner", "🔨 Building implementation plan...")
-    )
+    status.append(format_issue_message(adw_id, "planner", "🔨 Building implementation plan..."))
 
-    plan_file = create_plan(issue_number, adw_id, issue_class, issue_content)
+    plan_file = create_plan(issue_number, adw_id, issue_class, issue_file)
     print(f"✅ Plan created: {plan_file}")
 
+    # Checkpoint: a resumed run can pick up from the plan
     state.update(plan_file=plan_file)
     state.save("adw_plan_build")
 
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "planner", f"✅ Implementation plan created: `{plan_file}`")
-    )
+    status.append(format_issue_message(adw_id, "planner", f"✅ Implementation plan created: `{plan_file}`"))
 
-    # Commit plan
-    commit_msg = create_commit("planner", issue_class, issue_content, adw_id)
+    # Commit plan. This must finish before implementation starts: the /commit
+    # agent stages and commits the working tree itself, so running it alongside
+    # /implement could sweep half-written changes into the plan commit
+    commit_msg = create_commit("planner", issue_class, issue_file, adw_id)
     commit_changes(commit_msg)
     print(f"✅ Plan committed: {commit_msg}")
 
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "planner", "✅ Plan committed to git")
-    )
+    status.append(format_issue_message(adw_id, "planner", "✅ Plan committed to git"))
 
     # Step 4: Implement plan
     print("\n⚙️  Implementing plan...")
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "implementor", "🔨 Implementing plan...")
-    )
+    status.append(format_issue_message(adw_id, "implementor", "🔨 Implementing plan..."))
 
     implement_plan(plan_file, adw_id)
     print("✅ Implementation complete")
 
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "implementor", "✅ Implementation complete")
-    )
+    status.append(format_issue_message(adw_id, "implementor", "✅ Implementation complete"))
+
+    # Fold the state change log into a readable adw_state.json snapshot before
+    # the last commit, so a finished workflow leaves a clean working tree
+    state.compact()
 
     # Commit implementation
-    commit_msg = create_commit("implementor", issue_class, issue_content, adw_id)
+    commit_msg = create_commit("implementor", issue_class, issue_file, adw_id)
     commit_changes(commit_msg)
     print(f"✅ Implementation committed: {commit_msg}")
 
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "implementor", "✅ Implementation committed to git")
-    )
+    status.append(format_issue_message(adw_id, "implementor", "✅ Implementation committed to git"))
 
     # Step 5: Push branch and create PR
     print("\n🚀 Pushing branch to remote...")
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "ops", f"🚀 Pushing branch `{branch_name}` to remote...")
-    )
+    status.append(format_issue_message(adw_id, "ops", f"🚀 Pushing branch `{branch_name}` to remote..."))
 
     success, error = push_branch(branch_name)
     if not success:
         print(f"❌ Failed to push branch: {error}")
-        make_issue_comment(
-            str(issue_number),
-            format_issue_message(adw_id, "ops", f"❌ Failed to push branch: {error}")
-        )
+        status.append(format_issue_message(adw_id, "ops", f"❌ Failed to push branch: {error}"))
+        status.shutdown()
         sys.exit(1)
 
     print(f"✅ Branch pushed: {branch_name}")
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "ops", f"✅ Branch pushed: `{branch_name}`")
-    )
+    status.append(format_issue_message(adw_id, "ops", f"✅ Branch pushed: `{branch_name}`"))
 
     # Create pull request
     print(f"\n📋 Creating pull request...")
@@ -354,26 +338,20 @@ def main():
     success, pr_url, error = create_pull_request(branch_name, issue_number, pr_title, pr_body)
     if not success:
         print(f"❌ Failed to create PR: {error}")
-        make_issue_comment(
-            str(issue_number),
-            format_issue_message(adw_id, "ops", f"❌ Failed to create PR: {error}")
-        )
+        status.append(format_issue_message(adw_id, "ops", f"❌ Failed to create PR: {error}"))
     elif pr_url:
         print(f"✅ Pull request created: {pr_url}")
-        make_issue_comment(
-            str(issue_number),
-            format_issue_message(adw_id, "ops", f"✅ Pull request created: {pr_url}")
-        )
+        status.append(format_issue_message(adw_id, "ops", f"✅ Pull request created: {pr_url}"))
 
     print(f"\n✨ Workflow complete! ADW ID: {adw_id}")
     print(f"📂 State saved in: agents/{adw_id}/")
     if pr_url:
         print(f"🔗 PR: {pr_url}")
 
-    make_issue_comment(
-        str(issue_number),
-        format_issue_message(adw_id, "ops", f"✨ ADW Plan + Build workflow complete!\n\nBranch: `{branch_name}`\nPR: {pr_url if pr_url else 'Failed to create'}")
-    )
+    status.append(format_issue_message(adw_id, "ops", f"✨ ADW Plan + Build workflow complete!\n\nBranch: `{branch_name}`\nPR: {pr_url if pr_url else 'Failed to create'}"))
+
+    # Flush the final status update before exiting
+    status.shutdown()
 
 
 if __name__ == "__main__":